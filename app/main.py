@@ -1,16 +1,46 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+import os
+import time
 import uvicorn
 
 from .routes import visualizations
+from .tasks import start_ai_score_scheduler
 from .utils.logging import logger
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up and tear down the shared AI engine around the app's lifetime."""
+    visualizations.fit_insight_vectorizer()
+    scheduler = start_ai_score_scheduler()
+    yield
+    scheduler.shutdown(wait=False)
+    await visualizations.close_insight_engine()
+
+# Error-response timestamps only need second granularity, so cache the
+# formatted string instead of formatting a fresh datetime per request
+_timestamp_cache = (0, "")
+
+def _request_timestamp() -> str:
+    global _timestamp_cache
+    now_s = time.time_ns() // 1_000_000_000
+    if _timestamp_cache[0] != now_s:
+        _timestamp_cache = (
+            now_s,
+            datetime.fromtimestamp(now_s, tz=timezone.utc).isoformat()
+        )
+    return _timestamp_cache[1]
+
 app = FastAPI(
     title="Academic Journey Map",
     description="A visualization service for academic progress tracking",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware configuration
@@ -31,24 +61,24 @@ app.include_router(visualizations.router)
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
             "error_code": f"{exc.status_code}_ERROR",
-            "timestamp": str(datetime.now())
+            "timestamp": _request_timestamp()
         }
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "An unexpected error occurred",
             "error_code": "500_INTERNAL_ERROR",
-            "timestamp": str(datetime.now())
+            "timestamp": _request_timestamp()
         }
     )
 
@@ -58,10 +88,15 @@ async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
 if __name__ == "__main__":
+    # reload disables multi-worker mode, so keep it behind a dev-only flag
+    dev_reload = os.getenv("APP_RELOAD", "false").lower() == "true"
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        workers=4
+        reload=dev_reload,
+        workers=1 if dev_reload else 4,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning"
     )
\ No newline at end of file
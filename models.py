@@ -1,17 +1,17 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, DateTime, Table, JSON
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Float, DateTime, Table, JSON, event
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
 
 # Association tables for many-to-many relationships
 skill_course = Table('skill_course', Base.metadata,
-    Column('skill_id', Integer, ForeignKey('skills.id')),
-    Column('course_id', Integer, ForeignKey('courses.id'))
+    Column('skill_id', Integer, ForeignKey('skills.id'), index=True),
+    Column('course_id', Integer, ForeignKey('courses.id'), index=True)
 )
 
 project_skill = Table('project_skill', Base.metadata,
-    Column('project_id', Integer, ForeignKey('projects.id')),
-    Column('skill_id', Integer, ForeignKey('skills.id'))
+    Column('project_id', Integer, ForeignKey('projects.id'), index=True),
+    Column('skill_id', Integer, ForeignKey('skills.id'), index=True)
 )
 
 class User(Base):
@@ -48,8 +48,12 @@ class Course(Base):
     credits = Column(Float)
     status = Column(String)  # In Progress, Completed, Planned
     importance_score = Column(Float)  # AI-calculated importance for career goals
-    user_id = Column(Integer, ForeignKey("users.id"))
-    
+    last_scored_at = Column(DateTime)  # When the AI scores were last refreshed
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+
+    # Composite index for the common "courses for user filtered by status" lookup
+    __table_args__ = (Index('ix_courses_user_status', 'user_id', 'status'),)
+
     # Relationships
     user = relationship("User", back_populates="courses")
     skills = relationship("Skill", secondary=skill_course, back_populates="courses")
@@ -66,7 +70,7 @@ class Skill(Base):
     last_used = Column(DateTime)
     growth_rate = Column(Float)  # AI-calculated skill growth rate
     market_demand = Column(Float)  # AI-calculated market demand
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     
     # Relationships
     user = relationship("User", back_populates="skills")
@@ -86,8 +90,12 @@ class Project(Base):
     demo_url = Column(String)
     impact_score = Column(Float)  # AI-calculated project impact
     complexity_score = Column(Float)  # AI-calculated complexity
-    user_id = Column(Integer, ForeignKey("users.id"))
-    
+    last_scored_at = Column(DateTime)  # When the AI scores were last refreshed
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+
+    # Composite index for the common "projects for user filtered by status" lookup
+    __table_args__ = (Index('ix_projects_user_status', 'user_id', 'status'),)
+
     # Relationships
     user = relationship("User", back_populates="projects")
     skills = relationship("Skill", secondary=project_skill, back_populates="projects")
@@ -105,7 +113,7 @@ class Goal(Base):
     progress = Column(Float)
     priority = Column(Integer)
     ai_recommendations = Column(JSON)  # AI-generated recommendations
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     
     # Relationships
     user = relationship("User", back_populates="goals")
@@ -119,11 +127,37 @@ class Achievement(Base):
     date_achieved = Column(DateTime)
     category = Column(String)  # Academic, Project, Extra-curricular
     impact_score = Column(Float)  # AI-calculated achievement impact
-    user_id = Column(Integer, ForeignKey("users.id"))
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True, index=True)
     
     # Relationships
     user = relationship("User", back_populates="achievements")
     course = relationship("Course", back_populates="achievements")
-    project = relationship("Project", back_populates="achievements")
\ No newline at end of file
+    project = relationship("Project", back_populates="achievements")
+
+class UserSkillSummary(Base):
+    """Materialized skills-with-market-demand payload, one row per user.
+
+    The radar and network endpoints repeat the same "skills filtered by
+    category plus market demand" aggregation; this row stores it precomputed
+    so reads become a single indexed fetch. Skill changes delete the row
+    (see the listeners below) and the next read rebuilds it.
+    """
+    __tablename__ = "user_skill_summary"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    payload = Column(JSON)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+@event.listens_for(Skill, "after_insert")
+@event.listens_for(Skill, "after_update")
+@event.listens_for(Skill, "after_delete")
+def _mark_skill_summary_stale(mapper, connection, target):
+    # Runs on the flush connection, so the stale row disappears in the same
+    # transaction as the skill change
+    connection.execute(
+        UserSkillSummary.__table__.delete().where(
+            UserSkillSummary.user_id == target.user_id
+        )
+    )
\ No newline at end of file
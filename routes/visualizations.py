@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, joinedload
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
+import hashlib
+import numpy as np
 
-from ..database import get_db
-from ..models import User, Course, Skill, Project, Goal, Achievement
+from ..database import get_db, SessionLocal
+from ..models import User, Course, Skill, Project, Goal, Achievement, UserSkillSummary
+from ..tasks import recompute_skill_summary
 from ..visualization import AcademicVisualizer
-from ..ai_service import AcademicInsightEngine
+from ..ai_service import insight_engine
 from ..schemas.visualization import (
     SkillNetworkResponse,
     TimelineResponse,
@@ -15,14 +19,229 @@ from ..schemas.visualization import (
     GoalProgressResponse
 )
 from ..utils.logging import logger
-from ..utils.cache import cache_visualization, invalidate_user_cache, get_cache_stats
+from ..utils.cache import (
+    cache_visualization,
+    invalidate_user_cache,
+    get_cache_stats,
+    pack_plot_data,
+    get_plot_data,
+    store_skill_network_source,
+    get_skill_network_source
+)
 from ..utils.export import VisualizationExporter
 
 router = APIRouter(prefix="/visualizations", tags=["visualizations"])
 visualizer = AcademicVisualizer()
-insight_engine = AcademicInsightEngine()
 exporter = VisualizationExporter()
 
+def fit_insight_vectorizer():
+    """Pre-fit the engine's TF-IDF vectorizer on all course descriptions.
+
+    Called from the application lifespan on startup.
+    """
+    db = SessionLocal()
+    try:
+        corpus = [row[0] for row in db.query(Course.description).all()]
+        insight_engine.fit_vectorizer(corpus)
+    except Exception as e:
+        logger.error(f"Error fitting TF-IDF vectorizer: {str(e)}")
+    finally:
+        db.close()
+
+async def close_insight_engine():
+    """Release the engine's pooled HTTP and OpenAI clients.
+
+    Called from the application lifespan on shutdown.
+    """
+    await insight_engine.close()
+
+def _skill_network_etag(
+    user_id: int,
+    min_proficiency: Optional[int],
+    category_filter: Optional[str],
+    db: Session
+) -> str:
+    """Stable content hash over the rows feeding the skill network.
+
+    Three id/score scalar queries are far cheaper than building the
+    visualization, so a 304 can short-circuit before any plotting work.
+    """
+    etag_source = (
+        user_id,
+        min_proficiency,
+        category_filter,
+        tuple(db.query(Skill.id, Skill.proficiency_level, Skill.category)
+              .filter(Skill.user_id == user_id).all()),
+        tuple(db.query(Course.id, Course.importance_score)
+              .filter(Course.user_id == user_id).all()),
+        tuple(db.query(Project.id, Project.impact_score)
+              .filter(Project.user_id == user_id).all())
+    )
+    return hashlib.blake2b(repr(etag_source).encode(), digest_size=16).hexdigest()
+
+async def _load_skill_network_source(user_id: int, db: Session) -> Dict[str, Any]:
+    """Load (or rebuild) the user's unfiltered skill network source data.
+
+    One Redis entry per user serves every filter permutation; pruning the
+    cached lists in Python is far cheaper than re-querying and re-scoring
+    for each min_proficiency/category_filter combination.
+    """
+    source = await get_skill_network_source(user_id)
+    if source is not None:
+        return source
+
+    # Eager-load every collection the endpoint touches so the whole read
+    # is a handful of queries instead of one lazy SELECT per relationship.
+    # The sync Session would otherwise block the event loop, so every query
+    # execution runs in FastAPI's threadpool
+    user = await run_in_threadpool(
+        db.query(User)
+        .options(
+            selectinload(User.courses).selectinload(Course.skills),
+            selectinload(User.projects).selectinload(Project.skills)
+        )
+        .filter(User.id == user_id)
+        .first
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    skills = [{
+        'name': name,
+        'proficiency_level': proficiency_level,
+        'category': category
+    } for name, proficiency_level, category in await run_in_threadpool(
+        db.query(Skill.name, Skill.proficiency_level, Skill.category)
+        .filter(Skill.user_id == user_id)
+        .all
+    )]
+
+    # Serve the persisted AI score; only courses never scored go through
+    # one batched LLM call, keyed back by id
+    unscored_courses = [c for c in user.courses if c.importance_score is None]
+    importance_map: Dict[int, float] = {}
+    if unscored_courses:
+        career_goals = [
+            title for (title,) in await run_in_threadpool(
+                db.query(Goal.title).filter(Goal.user_id == user_id).all
+            )
+        ]
+        scores = await insight_engine.analyze_courses_importance_batch(
+            [{'name': c.name, 'description': c.description} for c in unscored_courses],
+            career_goals
+        )
+        importance_map = {c.id: score for c, score in zip(unscored_courses, scores)}
+
+    # Explicit loops so the edge count accumulates during construction
+    # instead of re-walking the finished lists
+    edge_count = 0
+    courses = []
+    for course in user.courses:
+        course_skills = [{'name': skill.name} for skill in course.skills]
+        edge_count += len(course_skills)
+        courses.append({
+            'code': course.code,
+            'name': course.name,
+            'description': course.description,
+            'skills': course_skills,
+            # 0.0 is a legitimate stored score; only a NULL column falls
+            # back to the freshly batched (or default) value
+            'importance_score': course.importance_score
+                                if course.importance_score is not None
+                                else importance_map.get(course.id, 0.5)
+        })
+
+    projects = []
+    for project in user.projects:
+        project_skills = [{'name': skill.name} for skill in project.skills]
+        edge_count += len(project_skills)
+        projects.append({
+            'title': project.title,
+            'description': project.description,
+            'skills': project_skills
+        })
+
+    source = {
+        'user_name': user.name,
+        'skills': skills,
+        'courses': courses,
+        'projects': projects,
+        'edge_count': edge_count
+    }
+    await store_skill_network_source(user_id, source)
+    return source
+
+async def _build_skill_network(
+    user_id: int,
+    min_proficiency: Optional[int] = None,
+    category_filter: Optional[str] = None,
+    db: Session = None
+) -> SkillNetworkResponse:
+    """Build the skill network response; shared by the cached endpoint and export.
+
+    Keeping the builder outside the cache decorator means the export path can
+    reuse it without writing a cache entry keyed on its own kwargs.
+    """
+    source = await _load_skill_network_source(user_id, db)
+
+    # Derive the requested variant from the full graph: one pass prunes
+    # skills and collects the surviving categories
+    skills = []
+    categories = set()
+    for skill in source['skills']:
+        if min_proficiency is not None and skill['proficiency_level'] < min_proficiency:
+            continue
+        if category_filter is not None and skill['category'] != category_filter:
+            continue
+        categories.add(skill['category'])
+        skills.append(skill)
+
+    if not skills:
+        raise HTTPException(
+            status_code=422,
+            detail="No skills found matching the specified criteria"
+        )
+
+    courses = source['courses']
+    projects = source['projects']
+    visualization = visualizer.create_skill_network(skills, courses, projects)
+
+    return SkillNetworkResponse.construct(
+        plot_data=visualization,
+        title=f"Skill Network for {source['user_name']}",
+        description="Interactive visualization of skills, courses, and projects",
+        node_count=len(skills) + len(courses) + len(projects),
+        edge_count=source['edge_count'],
+        categories=list(categories)
+    )
+
+@cache_visualization(prefix="viz:skill")
+async def _cached_skill_network(
+    user_id: int,
+    min_proficiency: Optional[int] = None,
+    category_filter: Optional[str] = None,
+    db: Session = None
+) -> SkillNetworkResponse:
+    """Cache boundary for the skill network: builds and stores on a miss.
+
+    Kept separate from the route handler so conditional-request handling
+    runs on every request — the decorator would otherwise answer cache
+    hits before the If-None-Match check and feed 304 Responses into the
+    store on a miss.
+    """
+    result = await _build_skill_network(
+        user_id,
+        min_proficiency=min_proficiency,
+        category_filter=category_filter,
+        db=db
+    )
+
+    # Store the heavy plot_data once under its content hash; the response
+    # carries only the ref, resolved via /visualizations/data/{data_ref}
+    # (or the inline payload when Redis is down)
+    result.plot_data = await pack_plot_data(result.plot_data)
+    return result
+
 @router.get(
     "/skill-network/{user_id}",
     response_model=SkillNetworkResponse,
@@ -32,65 +251,44 @@ exporter = VisualizationExporter()
         500: {"description": "Internal server error"}
     }
 )
-@cache_visualization(prefix="viz:skill")
 async def get_skill_network(
     user_id: int,
     min_proficiency: Optional[int] = Query(None, ge=1, le=10),
     category_filter: Optional[str] = None,
+    request: Request = None,
     response: Response = None,
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """Generate an interactive network visualization of skills, courses, and projects."""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Prepare data with AI insights and filtering
-        skills = [{
-            'name': skill.name,
-            'proficiency_level': skill.proficiency_level,
-            'category': skill.category
-        } for skill in user.skills
-        if (min_proficiency is None or skill.proficiency_level >= min_proficiency) and
-           (category_filter is None or skill.category == category_filter)]
-        
-        if not skills:
-            raise HTTPException(
-                status_code=422,
-                detail="No skills found matching the specified criteria"
-            )
-        
-        courses = [{
-            'code': course.code,
-            'name': course.name,
-            'description': course.description,
-            'skills': [{'name': skill.name} for skill in course.skills],
-            'importance_score': insight_engine.analyze_course_importance(course)
-        } for course in user.courses]
-        
-        projects = [{
-            'title': project.title,
-            'description': project.description,
-            'skills': [{'name': skill.name} for skill in project.skills]
-        } for project in user.projects]
-        
-        visualization = visualizer.create_skill_network(skills, courses, projects)
-        
-        # Set cache control headers
-        if response:
-            response.headers["Cache-Control"] = "max-age=3600"
-            response.headers["ETag"] = f"skill-network-{user_id}-{len(skills)}"
-        
-        return SkillNetworkResponse(
-            plot_data=visualization,
-            title=f"Skill Network for {user.name}",
-            description="Interactive visualization of skills, courses, and projects",
-            node_count=len(skills) + len(courses) + len(projects),
-            edge_count=sum(len(c['skills']) for c in courses) + sum(len(p['skills']) for p in projects),
-            categories=list(set(s['category'] for s in skills))
+        # A matching If-None-Match proves the client already holds this exact
+        # content, so answer 304 before any cache lookup or visualization work
+        etag = await run_in_threadpool(
+            _skill_network_etag, user_id, min_proficiency, category_filter, db
         )
-        
+        if request is not None and request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        result = await _cached_skill_network(
+            user_id=user_id,
+            min_proficiency=min_proficiency,
+            category_filter=category_filter,
+            db=db
+        )
+
+        # Cache hits come back as a ready Response; both shapes carry the
+        # validators the next conditional request needs
+        if isinstance(result, Response):
+            result.headers["Cache-Control"] = "private, max-age=3600"
+            result.headers["ETag"] = etag
+        elif response:
+            response.headers["Cache-Control"] = "private, max-age=3600"
+            response.headers["ETag"] = etag
+
+        return result
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating skill network: {str(e)}")
         raise HTTPException(
@@ -114,7 +312,9 @@ async def export_skill_network(
 ) -> FileResponse:
     """Export the skill network visualization in the specified format."""
     try:
-        visualization_data = await get_skill_network(user_id, db=db)
+        # Call the builder directly: no Redis round-trip and no cache entry
+        # keyed on the export endpoint's kwargs
+        visualization_data = await _build_skill_network(user_id, db=db)
         
         filepath = exporter.export(
             visualization_data.dict(),
@@ -135,7 +335,307 @@ async def export_skill_network(
             detail="An error occurred during export"
         )
 
-# Similar updates for other visualization endpoints...
+@router.get(
+    "/progress-timeline/{user_id}",
+    response_model=TimelineResponse,
+    responses={
+        404: {"description": "User not found"},
+        422: {"description": "No timeline events found"},
+        500: {"description": "Internal server error"}
+    }
+)
+@cache_visualization(prefix="viz:timeline")
+async def get_progress_timeline(
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    response: Response = None,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Generate an interactive timeline of courses and achievements."""
+    try:
+        user = await run_in_threadpool(
+            db.query(User).filter(User.id == user_id).first
+        )
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        # Apply the optional date window in SQL; course rows come back as
+        # tuples feeding straight into the event dicts
+        course_query = db.query(
+            Course.year, Course.name, Course.description, Course.importance_score
+        ).filter(Course.user_id == user_id)
+        if start_date is not None:
+            course_query = course_query.filter(Course.year >= start_date.year)
+        if end_date is not None:
+            course_query = course_query.filter(Course.year <= end_date.year)
+
+        courses = [{
+            'year': year,
+            'name': name,
+            'description': description,
+            'importance_score': importance_score if importance_score is not None else 0.5
+        } for year, name, description, importance_score
+            in await run_in_threadpool(course_query.all)]
+
+        achievement_query = (
+            db.query(Achievement)
+            .options(joinedload(Achievement.project))
+            .filter(Achievement.user_id == user_id)
+        )
+        if start_date is not None:
+            achievement_query = achievement_query.filter(Achievement.date_achieved >= start_date)
+        if end_date is not None:
+            achievement_query = achievement_query.filter(Achievement.date_achieved <= end_date)
+        user_achievements = await run_in_threadpool(achievement_query.all)
+
+        # Score each distinct unscored project exactly once: a user with five
+        # achievements on one project used to trigger five identical LLM calls
+        unscored_projects = list({
+            achievement.project.id: achievement.project
+            for achievement in user_achievements
+            if achievement.project is not None and achievement.project.impact_score is None
+        }.values())
+        impact_scores = await insight_engine.analyze_projects_impact_batch(
+            [{'title': p.title, 'description': p.description} for p in unscored_projects]
+        )
+        impact_map = dict(zip([p.id for p in unscored_projects], impact_scores))
+
+        achievements = []
+        for achievement in user_achievements:
+            project = achievement.project
+            # 0.0 is a legitimate stored score — only NULL means unscored
+            if project is not None:
+                impact = (project.impact_score if project.impact_score is not None
+                          else impact_map.get(project.id, 0.5))
+            else:
+                impact = (achievement.impact_score
+                          if achievement.impact_score is not None else 0.5)
+            achievements.append({
+                'title': achievement.title,
+                'description': achievement.description,
+                'date_achieved': achievement.date_achieved,
+                'impact_score': impact
+            })
+
+        event_dates = [a['date_achieved'] for a in achievements]
+        event_dates += [datetime(c['year'], 1, 1) for c in courses if c['year']]
+        if not event_dates:
+            raise HTTPException(
+                status_code=422,
+                detail="No timeline events found for this user"
+            )
+
+        visualization = visualizer.create_progress_timeline(courses, achievements)
+
+        if response:
+            response.headers["Cache-Control"] = "max-age=3600"
+
+        return TimelineResponse.construct(
+            plot_data=await pack_plot_data(visualization),
+            title=f"Progress Timeline for {user.name}",
+            description="Interactive timeline of courses and achievements",
+            start_date=min(event_dates),
+            end_date=max(event_dates),
+            event_count=len(courses) + len(achievements)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating progress timeline: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while generating the visualization"
+        )
+
+@router.get(
+    "/skill-radar/{user_id}",
+    response_model=SkillRadarResponse,
+    responses={
+        404: {"description": "User not found"},
+        422: {"description": "No skills found"},
+        500: {"description": "Internal server error"}
+    }
+)
+@cache_visualization(prefix="viz:radar")
+async def get_skill_radar(
+    user_id: int,
+    category_filter: Optional[str] = None,
+    response: Response = None,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Generate a radar chart of skill proficiency vs market demand by category."""
+    try:
+        user = await run_in_threadpool(
+            db.query(User).filter(User.id == user_id).first
+        )
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        # Fast path: read the materialized summary row — skills with market
+        # demand already resolved. Skill changes delete it (model event
+        # listeners), in which case it's rebuilt once here.
+        summary = await run_in_threadpool(
+            db.query(UserSkillSummary)
+            .filter(UserSkillSummary.user_id == user_id)
+            .first
+        )
+        if summary is not None:
+            payload = summary.payload
+        else:
+            payload = await recompute_skill_summary(user_id, db)
+
+        # One explicit pass filters by category and accumulates the category
+        # set the response needs, instead of re-walking the list afterwards
+        skills = []
+        categories = set()
+        for skill in payload['skills']:
+            if category_filter is not None and skill['category'] != category_filter:
+                continue
+            categories.add(skill['category'])
+            skills.append(skill)
+
+        if not skills:
+            raise HTTPException(
+                status_code=422,
+                detail="No skills found matching the specified criteria"
+            )
+
+        # Proficiency is 1-10, so int8 fits and the mean runs as a single
+        # vectorized reduction instead of a Python-int sum loop
+        proficiency = np.fromiter(
+            (skill['proficiency_level'] for skill in skills),
+            dtype=np.int8,
+            count=len(skills)
+        )
+
+        visualization = visualizer.create_skill_radar(skills)
+
+        if response:
+            response.headers["Cache-Control"] = "max-age=3600"
+
+        return SkillRadarResponse.construct(
+            plot_data=await pack_plot_data(visualization),
+            title=f"Skill Radar for {user.name}",
+            description="Skill proficiency compared with market demand by category",
+            skill_categories=list(categories),
+            total_skills=len(skills),
+            average_proficiency=float(proficiency.mean())
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating skill radar: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while generating the visualization"
+        )
+
+@router.get(
+    "/goal-progress/{user_id}",
+    response_model=GoalProgressResponse,
+    responses={
+        404: {"description": "User not found"},
+        422: {"description": "No goals found"},
+        500: {"description": "Internal server error"}
+    }
+)
+@cache_visualization(prefix="viz:goals")
+async def get_goal_progress(
+    user_id: int,
+    category_filter: Optional[str] = None,
+    active_only: bool = False,
+    response: Response = None,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Generate a progress chart of the user's goals grouped by category."""
+    try:
+        user = await run_in_threadpool(
+            db.query(User).filter(User.id == user_id).first
+        )
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        goal_query = db.query(
+            Goal.title, Goal.category, Goal.progress
+        ).filter(Goal.user_id == user_id)
+        if category_filter is not None:
+            goal_query = goal_query.filter(Goal.category == category_filter)
+        if active_only:
+            goal_query = goal_query.filter(Goal.status != 'Achieved')
+
+        goal_rows = await run_in_threadpool(goal_query.all)
+
+        # Single pass: build the dicts while accumulating the category set
+        goals = []
+        categories = set()
+        for title, category, progress in goal_rows:
+            categories.add(category)
+            goals.append({
+                'title': title,
+                'category': category,
+                'progress': progress or 0.0
+            })
+
+        if not goals:
+            raise HTTPException(
+                status_code=422,
+                detail="No goals found matching the specified criteria"
+            )
+
+        # float32 (progress is fractional) keeps the array compact and the
+        # mean a single vectorized reduction
+        progress_values = np.fromiter(
+            ((row[2] or 0.0) for row in goal_rows),
+            dtype=np.float32,
+            count=len(goal_rows)
+        )
+
+        visualization = visualizer.create_goal_progress_chart(goals)
+
+        if response:
+            response.headers["Cache-Control"] = "max-age=3600"
+
+        return GoalProgressResponse.construct(
+            plot_data=await pack_plot_data(visualization),
+            title=f"Goal Progress for {user.name}",
+            description="Progress toward academic and career goals by category",
+            goal_categories=list(categories),
+            total_goals=len(goals),
+            average_progress=float(progress_values.mean())
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating goal progress chart: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred while generating the visualization"
+        )
+
+@router.get(
+    "/data/{data_ref}",
+    responses={
+        404: {"description": "Data not found or expired"}
+    }
+)
+async def get_visualization_data(data_ref: str) -> Response:
+    """Resolve a plot_data content ref returned by the visualization endpoints."""
+    blob = await get_plot_data(data_ref)
+    if blob is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Visualization data not found or expired"
+        )
+    # Content-addressed, so the payload for a given ref never changes
+    return Response(
+        content=blob,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=604800, immutable"}
+    )
 
 @router.post("/cache/invalidate/{user_id}")
 async def invalidate_visualizations_cache(
@@ -144,7 +644,7 @@ async def invalidate_visualizations_cache(
 ) -> Dict[str, str]:
     """Invalidate cached visualizations for a user."""
     try:
-        invalidate_user_cache(user_id, prefix=visualization_type)
+        await invalidate_user_cache(user_id, prefix=visualization_type)
         return {"message": "Cache invalidated successfully"}
     except Exception as e:
         logger.error(f"Cache invalidation error: {str(e)}")
@@ -156,7 +656,7 @@ async def invalidate_visualizations_cache(
 @router.get("/cache/stats")
 async def get_visualization_cache_stats() -> Dict[str, int]:
     """Get statistics about cached visualizations."""
-    return get_cache_stats()
+    return await get_cache_stats()
 
 @router.get("/export/formats")
 async def get_supported_export_formats() -> Dict[str, str]:
@@ -0,0 +1,225 @@
+import asyncio
+import io
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, selectinload
+
+from database import SessionLocal
+from models import User, Course, Project, Skill, Goal, UserSkillSummary
+from ai_service import AcademicInsightEngine, insight_engine, _FLOAT_RE
+from utils.cache import invalidate_user_cache
+
+# How often to check an in-flight nightly batch for completion
+BATCH_POLL_INTERVAL = 60
+
+async def refresh_ai_scores(user_id: int, db: Optional[Session] = None) -> None:
+    """Recompute and persist AI scores for one user's courses, projects and skills.
+
+    The visualization endpoints serve importance/impact/demand straight from
+    the database columns; this job is the only place the OpenAI-backed scoring
+    runs. Trigger it from user-update events or a nightly schedule.
+    """
+    session = db if db is not None else SessionLocal()
+    try:
+        user = (
+            session.query(User)
+            .options(
+                selectinload(User.courses),
+                selectinload(User.projects),
+                selectinload(User.skills),
+                selectinload(User.goals)
+            )
+            .filter(User.id == user_id)
+            .first()
+        )
+        if not user:
+            return
+
+        scored_at = datetime.utcnow()
+        career_goals = [goal.title for goal in user.goals]
+
+        course_scores = await insight_engine.analyze_courses_importance_batch(
+            [{'name': c.name, 'description': c.description} for c in user.courses],
+            career_goals
+        )
+        for course, score in zip(user.courses, course_scores):
+            course.importance_score = score
+            course.last_scored_at = scored_at
+
+        project_scores = await insight_engine.analyze_projects_impact_batch(
+            [{'title': p.title, 'description': p.description} for p in user.projects]
+        )
+        for project, score in zip(user.projects, project_scores):
+            project.impact_score = score
+            project.last_scored_at = scored_at
+
+        demand_scores = await insight_engine._gather_bounded(
+            [insight_engine.get_market_demand(skill.name) for skill in user.skills]
+        )
+        for skill, score in zip(user.skills, demand_scores):
+            skill.market_demand = score
+
+        session.commit()
+    finally:
+        if db is None:
+            session.close()
+
+async def recompute_skill_summary(user_id: int, db: Session) -> Dict:
+    """Rebuild and persist the user's materialized skill summary row.
+
+    Called lazily by the visualization endpoints when the row is missing —
+    skill changes delete it via the model event listeners — so a rebuild
+    happens at most once per change, not once per request.
+    """
+    skill_query = db.query(
+        Skill.name, Skill.proficiency_level, Skill.category, Skill.market_demand
+    ).filter(Skill.user_id == user_id)
+    rows = await run_in_threadpool(skill_query.all)
+
+    demand_map = await insight_engine.get_market_demand_batch(
+        [name for name, _, _, market_demand in rows if market_demand is None]
+    )
+    payload = {
+        'skills': [{
+            'name': name,
+            'proficiency_level': proficiency_level,
+            'category': category,
+            'market_demand': market_demand if market_demand is not None
+                             else demand_map.get(name, 0.5)
+        } for name, proficiency_level, category, market_demand in rows]
+    }
+
+    def _persist():
+        db.merge(UserSkillSummary(
+            user_id=user_id,
+            payload=payload,
+            updated_at=datetime.utcnow()
+        ))
+        db.commit()
+    await run_in_threadpool(_persist)
+    return payload
+
+def _score_request(custom_id: str, system_prompt: str, payload: Dict) -> str:
+    """One JSONL line for the Batch API's /v1/chat/completions endpoint."""
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": json.dumps(payload)}
+            ],
+            "temperature": 0,
+            "max_tokens": 4
+        }
+    })
+
+async def refresh_ai_scores_nightly() -> None:
+    """Refresh every course and project score through the OpenAI Batch API.
+
+    Batch requests cost half the synchronous price with a 24h completion
+    window — the right trade-off for a bulk refresh that nothing waits on.
+    Results are written back with bulk_update_mappings in two statements.
+    """
+    session = SessionLocal()
+    try:
+        goals_by_user: Dict[int, List[str]] = {}
+        for goal in session.query(Goal.user_id, Goal.title).all():
+            goals_by_user.setdefault(goal.user_id, []).append(goal.title)
+
+        lines = []
+        scored_user_ids = set()
+        for course in session.query(Course).all():
+            scored_user_ids.add(course.user_id)
+            lines.append(_score_request(
+                f"course-{course.id}",
+                AcademicInsightEngine.SYSTEM_COURSE_PROMPT,
+                {
+                    'name': course.name,
+                    'description': course.description,
+                    'career_goals': goals_by_user.get(course.user_id, [])
+                }
+            ))
+        for project in session.query(Project).all():
+            scored_user_ids.add(project.user_id)
+            lines.append(_score_request(
+                f"project-{project.id}",
+                AcademicInsightEngine.SYSTEM_PROJECT_PROMPT,
+                {
+                    'title': project.title,
+                    'description': project.description,
+                    'technologies': []
+                }
+            ))
+        if not lines:
+            return
+
+        client = insight_engine.client
+        # The Files API requires a .jsonl filename for batch uploads; a bare
+        # BytesIO uploads as "upload" and is rejected
+        batch_file = await client.files.create(
+            file=('scores.jsonl', io.BytesIO('\n'.join(lines).encode())),
+            purpose='batch'
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            await asyncio.sleep(BATCH_POLL_INTERVAL)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != 'completed' or not batch.output_file_id:
+            print(f"Nightly score batch finished with status {batch.status}")
+            return
+
+        output = await client.files.content(batch.output_file_id)
+        scored_at = datetime.utcnow()
+        course_updates = []
+        project_updates = []
+        for line in output.text.splitlines():
+            record = json.loads(line)
+            content = record['response']['body']['choices'][0]['message']['content']
+            match = _FLOAT_RE.search(content)
+            score = min(max(float(match.group()), 0), 1) if match else 0.5
+            kind, _, row_id = record['custom_id'].partition('-')
+            if kind == 'course':
+                course_updates.append({
+                    'id': int(row_id),
+                    'importance_score': score,
+                    'last_scored_at': scored_at
+                })
+            else:
+                project_updates.append({
+                    'id': int(row_id),
+                    'impact_score': score,
+                    'last_scored_at': scored_at
+                })
+
+        if course_updates:
+            session.bulk_update_mappings(Course, course_updates)
+        if project_updates:
+            session.bulk_update_mappings(Project, project_updates)
+        session.commit()
+
+        # bulk_update_mappings bypasses the ORM event listeners that normally
+        # invalidate the visualization cache, so do it explicitly here
+        for user_id in scored_user_ids:
+            await invalidate_user_cache(user_id)
+    finally:
+        session.close()
+
+def start_ai_score_scheduler():
+    """Schedule the nightly batch refresh at 03:00 UTC. Returns the scheduler."""
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    scheduler = AsyncIOScheduler(timezone="UTC")
+    scheduler.add_job(refresh_ai_scores_nightly, "cron", hour=3)
+    scheduler.start()
+    return scheduler
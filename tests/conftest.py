@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The application modules (visualization, models, ...) live at the repo root
+# and import each other by top-level name, so make the root importable when
+# pytest is run from anywhere
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
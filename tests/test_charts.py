@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from visualization import AcademicVisualizer
+
+def test_create_progress_timeline_chart():
+    """Test that the timeline chart builds from course and achievement events."""
+    visualizer = AcademicVisualizer()
+    courses = [{
+        'year': 2022,
+        'name': 'Intro to Programming',
+        'description': 'Basic programming concepts',
+        'importance_score': 0.7
+    }]
+    achievements = [{
+        'title': 'Course Completion',
+        'description': 'Completed CS101 with distinction',
+        'date_achieved': datetime(2023, 5, 1),
+        'impact_score': 0.8
+    }]
+
+    plot_data = visualizer.create_progress_timeline(courses, achievements)
+
+    assert len(plot_data['data']) > 0
+    assert {trace['name'] for trace in plot_data['data']} == {'Course', 'Achievement'}
@@ -113,8 +113,13 @@ def test_get_skill_network_with_filters(db_session, mocker):
     assert response.status_code == 200
     
     data = response.json()
-    assert all(skill["proficiency_level"] >= 7 for skill in data["plot_data"]["nodes"]
-              if "proficiency_level" in skill)
+    # plot_data carries a content reference; the figure itself is served by
+    # the /data/{data_ref} endpoint
+    assert "data_ref" in data["plot_data"]
+    assert data["categories"] == ["Programming"]
+
+    resolved = client.get(f"/visualizations/data/{data['plot_data']['data_ref']}")
+    assert resolved.status_code == 200
 
 def test_get_progress_timeline(db_session, mocker):
     """Test the progress timeline visualization endpoint."""
@@ -1,20 +1,170 @@
 from functools import wraps
 from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import orjson
 import redis
-import json
+import zstandard as zstd
+from sqlalchemy import event
 from datetime import timedelta
+from fastapi import Request, Response
+from pydantic import BaseModel
+from redis.asyncio import Redis
 
 from ..config import settings
 from .logging import logger
 
-# Initialize Redis connection
-redis_client = redis.Redis(
+# Async client so cache I/O suspends the coroutine instead of blocking the
+# event loop thread; raw bytes responses feed orjson and Response directly
+redis_client = Redis(
     host=settings.REDIS_HOST,
     port=settings.REDIS_PORT,
     db=settings.REDIS_DB,
-    decode_responses=True
+    decode_responses=False
 )
 
+# Visualization JSON compresses 4-8x, so blobs are stored zstd-compressed
+# (level 3: near-fastest with most of the ratio). Keys carry a viz:z: marker
+# and reads check the frame magic so pre-migration entries still decode.
+_zstd_compressor = zstd.ZstdCompressor(level=3)
+_zstd_decompressor = zstd.ZstdDecompressor()
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+def _compress(blob: bytes) -> bytes:
+    return _zstd_compressor.compress(blob)
+
+def _decompress(raw: bytes) -> bytes:
+    if raw[:4] == ZSTD_MAGIC:
+        return _zstd_decompressor.decompress(raw)
+    return raw
+
+# Hash holding per-visualization entry counters, maintained by the decorator
+# and invalidation path so stats never need a blocking KEYS scan. Entries that
+# expire naturally aren't decremented, so counts are upper bounds.
+STATS_KEY = "viz:stats"
+
+_STATS_LABELS = {
+    "viz:skill": "skill_network",
+    "viz:timeline": "timeline",
+    "viz:radar": "radar",
+    "viz:goals": "goals"
+}
+
+def _stats_field(key: str) -> str:
+    """Map a cache key like 'viz:z:skill:3:...' back to its counter field."""
+    parts = key.split(":")
+    if len(parts) > 2 and parts[1] == "z":
+        return f"viz:{parts[2]}"
+    return ":".join(parts[:2])
+
+# Framework plumbing that must never end up in a cache key
+_EXCLUDED_PARAMS = frozenset({"db", "response", "request"})
+
+def _make_cache_key(prefix: str, kwargs: Dict[str, Any]) -> str:
+    """Build a deterministic key from the endpoint's query parameters.
+
+    Only plain query/path parameters feed the digest; sessions, Request and
+    Response objects carry per-request identity that would make every key
+    unique and silently turn the cache into a miss machine.
+    """
+    hash_input = tuple(
+        (k, v) for k, v in sorted(kwargs.items())
+        if k not in _EXCLUDED_PARAMS
+        and not isinstance(v, (Request, Response))
+        and v is not None
+    )
+    digest = hashlib.blake2b(repr(hash_input).encode(), digest_size=8).hexdigest()
+    # viz:z: marks zstd-compressed entries; legacy uncompressed keys expire
+    # on their own TTL during migration
+    kind = prefix.split(":", 1)[-1]
+    return f"viz:z:{kind}:{kwargs.get('user_id')}:{digest}"
+
+# Content-addressed plot_data blobs live longer than response entries: the
+# same content always hashes to the same key, so re-storing is a no-op SETNX
+DATA_PREFIX = "viz:data"
+DATA_EXPIRATION = 7 * 24 * 3600
+
+async def store_plot_data(plot_data: Dict[str, Any]) -> str:
+    """Store a plot_data payload once under its content hash and return the ref.
+
+    Responses embed only the returned ref; identical payloads shared across a
+    user's visualizations (or across users) occupy one Redis entry.
+    """
+    blob = orjson.dumps(plot_data, option=orjson.OPT_SERIALIZE_NUMPY)
+    data_ref = hashlib.blake2b(blob, digest_size=16).hexdigest()
+    await redis_client.set(f"{DATA_PREFIX}:{data_ref}", _compress(blob),
+                           nx=True, ex=DATA_EXPIRATION)
+    return data_ref
+
+async def get_plot_data(data_ref: str) -> Optional[bytes]:
+    """Fetch a stored plot_data blob by its content hash, or None if expired."""
+    try:
+        raw = await redis_client.get(f"{DATA_PREFIX}:{data_ref}")
+    except redis.RedisError as e:
+        logger.error(f"Redis error fetching plot data: {str(e)}")
+        return None
+    return _decompress(raw) if raw is not None else None
+
+async def pack_plot_data(plot_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Swap a plot_data payload for its content-ref stub.
+
+    When Redis is unavailable the payload is returned inline instead, so
+    the endpoints keep answering 200 — just without the indirection.
+    """
+    try:
+        return {"data_ref": await store_plot_data(plot_data)}
+    except redis.RedisError as e:
+        logger.error(f"Redis error storing plot data: {str(e)}")
+        return plot_data
+
+# Single-flight settings: how long a build may hold the lock and how long
+# waiters poll for the winner's result before computing themselves
+LOCK_EXPIRATION = 30
+LOCK_POLL_INTERVAL = 0.05
+LOCK_MAX_POLLS = 100
+
+def _cached_response(content: bytes, expiration: int) -> Response:
+    """Serve stored bytes directly; FastAPI passes a Response through
+    untouched, skipping the Pydantic re-validation and re-serialization."""
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={
+            "Cache-Control": f"max-age={expiration}",
+            "X-Cache": "HIT"
+        }
+    )
+
+# Full unfiltered skill-network source, one entry per user: every
+# min_proficiency/category_filter permutation derives from it in Python, so
+# one rebuild serves all of them. The key follows the viz:z:{kind}:{user}:*
+# shape so the user-level invalidation scan catches it.
+SOURCE_EXPIRATION = 3600
+
+def _network_source_key(user_id: int) -> str:
+    return f"viz:z:skill:{user_id}:full"
+
+async def store_skill_network_source(user_id: int, source: Dict[str, Any]) -> None:
+    """Cache the unfiltered skill/course/project source data for a user."""
+    try:
+        await redis_client.setex(
+            _network_source_key(user_id),
+            SOURCE_EXPIRATION,
+            _compress(orjson.dumps(source))
+        )
+        await redis_client.hincrby(STATS_KEY, "viz:skill", 1)
+    except redis.RedisError as e:
+        logger.error(f"Redis error storing network source: {str(e)}")
+
+async def get_skill_network_source(user_id: int) -> Optional[Dict[str, Any]]:
+    """Fetch the cached unfiltered network source, or None past its TTL."""
+    try:
+        raw = await redis_client.get(_network_source_key(user_id))
+    except redis.RedisError as e:
+        logger.error(f"Redis error fetching network source: {str(e)}")
+        return None
+    return orjson.loads(_decompress(raw)) if raw is not None else None
+
 def cache_visualization(
     expiration: int = 3600,  # 1 hour default
     prefix: str = "viz"
@@ -30,39 +180,80 @@ def cache_visualization(
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Generate cache key from function arguments
-            cache_key = f"{prefix}:{kwargs.get('user_id')}:"
-            cache_key += ":".join(f"{k}={v}" for k, v in sorted(kwargs.items())
-                                if k != "db" and v is not None)
-            
+            cache_key = _make_cache_key(prefix, kwargs)
+            lock_key = f"lock:{cache_key}"
+            got_lock = False
+
             # Try to get cached result
             try:
-                cached_result = redis_client.get(cache_key)
+                cached_result = await redis_client.get(cache_key)
                 if cached_result:
                     logger.info(f"Cache hit for key: {cache_key}")
-                    return json.loads(cached_result)
-                
-                # Generate new result if not cached
-                result = await func(*args, **kwargs)
-                
-                # Cache the result
-                redis_client.setex(
-                    cache_key,
-                    expiration,
-                    json.dumps(result)
+                    return _cached_response(_decompress(cached_result), expiration)
+
+                # Single-flight: only the lock holder rebuilds an expired
+                # entry; everyone else polls briefly for its result instead
+                # of stampeding the DB with identical builds
+                got_lock = await redis_client.set(
+                    lock_key, "1", nx=True, ex=LOCK_EXPIRATION
                 )
-                logger.info(f"Cached result for key: {cache_key}")
-                
-                return result
-                
+                if not got_lock:
+                    for _ in range(LOCK_MAX_POLLS):
+                        await asyncio.sleep(LOCK_POLL_INTERVAL)
+                        cached_result = await redis_client.get(cache_key)
+                        if cached_result:
+                            logger.info(f"Cache hit after wait for key: {cache_key}")
+                            return _cached_response(_decompress(cached_result), expiration)
+                        if not await redis_client.exists(lock_key):
+                            # Holder finished without caching (or died);
+                            # fall through and compute ourselves
+                            break
             except redis.RedisError as e:
                 logger.error(f"Redis error: {str(e)}")
-                # Fall back to uncached result
+                # Fall back to an uncached build
                 return await func(*args, **kwargs)
-                
+
+            try:
+                # Generate new result if not cached
+                result = await func(*args, **kwargs)
+
+                # Pass-through responses (304s, raw bytes) are not
+                # cacheable payloads; hand them straight back
+                if isinstance(result, Response):
+                    return result
+
+                # Cache the orjson-serialized bytes: C-implemented encoding
+                # and numpy/datetime support, no pure-Python json pass.
+                # Models built with .construct() still dump through .dict()
+                # — orjson can't encode them directly. A failed write only
+                # loses the cache entry, never the finished build.
+                try:
+                    payload = result.dict() if isinstance(result, BaseModel) else result
+                    await redis_client.setex(
+                        cache_key,
+                        expiration,
+                        _compress(orjson.dumps(
+                            payload,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+                        ))
+                    )
+                    await redis_client.hincrby(STATS_KEY, prefix, 1)
+                    logger.info(f"Cached result for key: {cache_key}")
+                except redis.RedisError as e:
+                    logger.error(f"Redis error caching result: {str(e)}")
+
+                return result
+            finally:
+                if got_lock:
+                    try:
+                        await redis_client.delete(lock_key)
+                    except redis.RedisError:
+                        pass
+
         return wrapper
     return decorator
 
-def invalidate_user_cache(user_id: int, prefix: Optional[str] = None) -> None:
+async def invalidate_user_cache(user_id: int, prefix: Optional[str] = None) -> None:
     """
     Invalidate all cached visualizations for a user.
     
@@ -71,27 +262,66 @@ def invalidate_user_cache(user_id: int, prefix: Optional[str] = None) -> None:
         prefix (str, optional): Specific visualization type to invalidate
     """
     try:
-        pattern = f"{prefix}:{user_id}:*" if prefix else f"*:{user_id}:*"
-        keys = redis_client.keys(pattern)
-        
-        if keys:
-            redis_client.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} cache entries for user {user_id}")
-            
+        if prefix:
+            pattern = f"viz:z:{prefix.split(':', 1)[-1]}:{user_id}:*"
+        else:
+            pattern = f"viz:z:*:{user_id}:*"
+
+        # SCAN instead of KEYS so Redis isn't blocked walking the whole
+        # keyspace; deletes and counter decrements go through one pipeline
+        deleted = 0
+        pipeline = redis_client.pipeline(transaction=False)
+        async for key in redis_client.scan_iter(match=pattern, count=500):
+            pipeline.delete(key)
+            pipeline.hincrby(STATS_KEY, _stats_field(key.decode()), -1)
+            deleted += 1
+        await pipeline.execute()
+
+        if deleted:
+            logger.info(f"Invalidated {deleted} cache entries for user {user_id}")
+
     except redis.RedisError as e:
         logger.error(f"Error invalidating cache: {str(e)}")
 
-def get_cache_stats() -> Dict[str, int]:
+async def get_cache_stats() -> Dict[str, int]:
     """Get statistics about cached visualizations."""
     try:
+        counters = await redis_client.hgetall(STATS_KEY)
         stats = {
-            "total_cached": len(redis_client.keys("*")),
-            "skill_network": len(redis_client.keys("viz:skill:*")),
-            "timeline": len(redis_client.keys("viz:timeline:*")),
-            "radar": len(redis_client.keys("viz:radar:*")),
-            "goals": len(redis_client.keys("viz:goals:*"))
+            label: max(int(counters.get(prefix.encode(), 0)), 0)
+            for prefix, label in _STATS_LABELS.items()
         }
+        stats["total_cached"] = sum(stats.values())
         return stats
     except redis.RedisError as e:
         logger.error(f"Error getting cache stats: {str(e)}")
-        return {"error": "Failed to get cache statistics"}
\ No newline at end of file
+        return {"error": "Failed to get cache statistics"}
+
+# Strong references to in-flight invalidation tasks; the loop only holds a
+# weak reference, so without these a task can be garbage-collected mid-run
+_invalidation_tasks: set = set()
+
+def _schedule_invalidation(mapper, connection, target):
+    """ORM event hook: invalidate the owning user's visualization cache.
+
+    The flush is synchronous, so the async invalidation is scheduled on the
+    running loop rather than awaited. Outside a loop (scripts, sync tests)
+    there is nothing to schedule on and entries simply age out via TTL.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(invalidate_user_cache(target.user_id))
+    _invalidation_tasks.add(task)
+    task.add_done_callback(_invalidation_tasks.discard)
+
+def _register_invalidation_listeners() -> None:
+    # Imported here so the models module never has to know about caching
+    from ..models import Skill, Course, Project, Goal, Achievement
+
+    for model in (Skill, Course, Project, Goal, Achievement):
+        for hook in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, hook, _schedule_invalidation)
+
+_register_invalidation_listeners()
\ No newline at end of file
@@ -1,16 +1,43 @@
 from typing import Dict, Any, Optional
+from functools import partial
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
+import csv
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
-import base64
+# pybase64's SIMD encoder is a drop-in for stdlib base64 and several times
+# faster on image-sized payloads
+try:
+    import pybase64 as _b64
+except ImportError:
+    import base64 as _b64
 from io import BytesIO
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 from .logging import logger
 
+# The orjson engine is an order of magnitude faster than the legacy
+# PlotlyJSONEncoder on figures with numeric arrays; fall back silently if
+# this plotly build doesn't accept it
+try:
+    pio.json.config.default_engine = "orjson"
+except (ImportError, ValueError):
+    pass
+
+# Schema validation walks every trace/layout property; our figures are
+# pipeline-internal dicts we just produced, so skip it unless debugging
+_VALIDATE_FIGURES = os.getenv("VIZ_VALIDATE", "false").lower() == "true"
+
 class VisualizationExporter:
     """Handles exporting visualizations in various formats."""
     
@@ -22,7 +49,10 @@ class VisualizationExporter:
         'json': 'Raw JSON data',
         'csv': 'CSV data export'
     }
-    
+    # Membership checks in export() go through the frozenset; the dict above
+    # stays for the description API
+    _SUPPORTED = frozenset(SUPPORTED_FORMATS)
+
     def __init__(self, output_dir: Optional[str] = None):
         """
         Initialize the exporter.
@@ -32,6 +62,20 @@ class VisualizationExporter:
         """
         self.output_dir = Path(output_dir) if output_dir else Path.cwd() / "exports"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # One render buffer reused across get_base64_image calls instead of
+        # a fresh BytesIO per render; the lock keeps shared exporters safe
+        self._img_buf = BytesIO()
+        self._img_buf_lock = threading.Lock()
+        # Dispatch table: one hash lookup per export instead of an if/elif
+        # chain, with the image formats binding their format string up front
+        self._dispatch = {
+            'html': self._export_html,
+            'json': self._export_json,
+            'csv': self._export_csv,
+            'png': partial(self._export_image, format='png'),
+            'svg': partial(self._export_image, format='svg'),
+            'pdf': partial(self._export_image, format='pdf')
+        }
     
     def export(
         self,
@@ -50,7 +94,7 @@ class VisualizationExporter:
         Returns:
             str: Path to the exported file
         """
-        if format not in self.SUPPORTED_FORMATS:
+        if format not in self._SUPPORTED:
             raise ValueError(f"Unsupported format: {format}")
             
         if not filename:
@@ -58,15 +102,7 @@ class VisualizationExporter:
             filename = f"visualization_{timestamp}"
             
         try:
-            if format == 'html':
-                return self._export_html(visualization_data, filename)
-            elif format in ['png', 'svg', 'pdf']:
-                return self._export_image(visualization_data, filename, format)
-            elif format == 'json':
-                return self._export_json(visualization_data, filename)
-            elif format == 'csv':
-                return self._export_csv(visualization_data, filename)
-                
+            return self._dispatch[format](visualization_data, filename)
         except Exception as e:
             logger.error(f"Export error: {str(e)}")
             raise
@@ -75,9 +111,24 @@ class VisualizationExporter:
         """Export as interactive HTML."""
         filepath = self.output_dir / f"{filename}.html"
         
-        fig = plotly.io.from_json(json.dumps(data['plot_data']))
-        plotly.offline.plot(fig, filename=str(filepath), auto_open=False)
-        
+        # Build the Figure straight from the dict; the old from_json call
+        # serialized to a string only to immediately parse it back
+        fig = go.Figure(data['plot_data'], skip_invalid=True,
+                        _validate=_VALIDATE_FIGURES)
+        # write_html goes through plotly.io and therefore the orjson engine;
+        # the legacy plotly.offline.plot path always used PlotlyJSONEncoder.
+        # Referencing plotly.js from the CDN instead of inlining it shrinks
+        # each file by ~3 MB; validation is skipped like everywhere else in
+        # this pipeline.
+        pio.write_html(
+            fig,
+            file=str(filepath),
+            include_plotlyjs='cdn',
+            full_html=True,
+            auto_open=False,
+            validate=False
+        )
+
         return str(filepath)
     
     def _export_image(
@@ -89,7 +140,8 @@ class VisualizationExporter:
         """Export as static image."""
         filepath = self.output_dir / f"{filename}.{format}"
         
-        fig = plotly.io.from_json(json.dumps(data['plot_data']))
+        fig = go.Figure(data['plot_data'], skip_invalid=True,
+                        _validate=_VALIDATE_FIGURES)
         fig.write_image(str(filepath))
         
         return str(filepath)
@@ -97,27 +149,59 @@ class VisualizationExporter:
     def _export_json(self, data: Dict[str, Any], filename: str) -> str:
         """Export raw JSON data."""
         filepath = self.output_dir / f"{filename}.json"
-        
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
-            
+
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    data,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+                ))
+        else:
+            # Stdlib fallback: slower and no native numpy support, but keeps
+            # the exporter working without the optional dependency
+            with open(filepath, 'w') as f:
+                json.dump(data, f, indent=2)
+
         return str(filepath)
     
+    # Rows per CSV write; keeps peak memory at O(chunk) instead of one
+    # DataFrame over the whole payload
+    CSV_CHUNK_SIZE = 50_000
+
+    def _write_csv_chunked(self, rows: list, filepath: Path) -> None:
+        """Write a list of row dicts as CSV, one chunk-sized frame at a time.
+
+        The handle is opened once in write mode so a repeated export with
+        the same filename overwrites instead of appending to the old file.
+        """
+        with open(filepath, 'w', newline='') as f:
+            for i in range(0, len(rows), self.CSV_CHUNK_SIZE):
+                pd.DataFrame(rows[i:i + self.CSV_CHUNK_SIZE]).to_csv(
+                    f, header=(i == 0), index=False
+                )
+
     def _export_csv(self, data: Dict[str, Any], filename: str) -> str:
         """Export data as CSV."""
         filepath = self.output_dir / f"{filename}.csv"
-        
+
         # Extract relevant data based on visualization type
         if 'nodes' in data['plot_data']:
             # Network visualization
-            df = pd.DataFrame(data['plot_data']['nodes'])
+            self._write_csv_chunked(data['plot_data']['nodes'], filepath)
         elif 'data' in data['plot_data']:
-            # Timeline or radar visualization
-            df = pd.DataFrame(data['plot_data']['data'])
+            # Timeline or radar visualization: already columnar, so stream
+            # rows through csv.writer without building a DataFrame at all
+            columns = data['plot_data']['data']
+            if isinstance(columns, dict):
+                with open(filepath, 'w', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(columns.keys())
+                    writer.writerows(zip(*columns.values()))
+            else:
+                self._write_csv_chunked(columns, filepath)
         else:
-            df = pd.DataFrame(data['plot_data'])
-            
-        df.to_csv(filepath, index=False)
+            pd.DataFrame(data['plot_data']).to_csv(filepath, index=False)
+
         return str(filepath)
     
     def get_base64_image(
@@ -135,12 +219,13 @@ class VisualizationExporter:
         Returns:
             str: Base64 encoded image data
         """
-        buffer = BytesIO()
-        
-        fig = plotly.io.from_json(json.dumps(data['plot_data']))
-        fig.write_image(buffer, format=format)
-        
-        image_data = base64.b64encode(buffer.getvalue()).decode()
+        fig = go.Figure(data['plot_data'], skip_invalid=True,
+                        _validate=_VALIDATE_FIGURES)
+        with self._img_buf_lock:
+            self._img_buf.seek(0)
+            self._img_buf.truncate()
+            fig.write_image(self._img_buf, format=format)
+            image_data = _b64.b64encode(self._img_buf.getvalue()).decode()
         return f"data:image/{format};base64,{image_data}"
     
     @staticmethod
@@ -1,122 +1,272 @@
+import os
+from datetime import date, datetime
 import plotly.graph_objects as go
 import plotly.express as px
 import networkx as nx
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
-import json
+
+# Skip per-property schema validation on figures we build ourselves; set
+# VIZ_VALIDATE=true to re-enable while debugging trace definitions
+_VALIDATE_FIGURES = os.getenv("VIZ_VALIDATE", "false").lower() == "true"
+
+try:
+    from scipy import optimize as _sp_optimize
+    from scipy.spatial import cKDTree as _cKDTree
+except ImportError:  # pragma: no cover - scipy ships with scikit-learn here
+    _sp_optimize = None
+
+def _fr_lbfgs_layout(n: int, edges: np.ndarray, seed: int = 42) -> np.ndarray:
+    """Fruchterman-Reingold layout minimized with SciPy's compiled L-BFGS.
+
+    Works directly on a node count and an (E, 2) int32 edge-index array —
+    no graph object needed. Same spring energy as nx.spring_layout, but
+    L-BFGS converges in fewer, cheaper iterations than the 50 Python-level
+    force sweeps, and repulsion is truncated to KD-tree neighbor pairs so
+    one evaluation costs O(N log N) instead of O(N^2). Falls back to
+    nx.spring_layout when SciPy is unavailable. Returns an (n, 2) array of
+    positions indexed by node id.
+    """
+    if _sp_optimize is None or n < 3:
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_edges_from(map(tuple, edges))
+        pos = nx.spring_layout(G)
+        return np.array([pos[i] for i in range(n)])
+
+    k = 1.0 / np.sqrt(n)  # FR optimal pair distance
+    cutoff = 3.0 * k
+    rng = np.random.default_rng(seed)
+
+    def energy_grad(flat):
+        pos = flat.reshape(n, 2)
+        grad = np.zeros_like(pos)
+        energy = 0.0
+
+        if len(edges):
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            dist = np.sqrt((delta ** 2).sum(axis=1)) + 1e-9
+            energy += (dist ** 3 / (3.0 * k)).sum()
+            force = (dist / k)[:, None] * delta
+            np.add.at(grad, edges[:, 0], force)
+            np.add.at(grad, edges[:, 1], -force)
+
+        pairs = _cKDTree(pos).query_pairs(r=cutoff, output_type='ndarray')
+        if len(pairs):
+            delta = pos[pairs[:, 0]] - pos[pairs[:, 1]]
+            d2 = (delta ** 2).sum(axis=1) + 1e-9
+            energy += -(k * k * np.log(np.sqrt(d2) / cutoff)).sum()
+            force = -(k * k / d2)[:, None] * delta
+            np.add.at(grad, pairs[:, 0], force)
+            np.add.at(grad, pairs[:, 1], -force)
+
+        return energy, grad.ravel()
+
+    result = _sp_optimize.minimize(
+        energy_grad,
+        rng.uniform(-0.5, 0.5, size=2 * n),
+        jac=True,
+        method='L-BFGS-B',
+        options={'maxiter': 50}
+    )
+    pos = result.x.reshape(n, 2)
+    # Rescale into spring_layout's [-1, 1] box so trace styling is unchanged
+    pos -= pos.mean(axis=0)
+    spread = np.abs(pos).max()
+    if spread > 0:
+        pos /= spread
+    return pos
 
 class AcademicVisualizer:
     def __init__(self):
         self.color_palette = px.colors.qualitative.Set3
+        # Resolve the three node-type colors once instead of indexing the
+        # palette inside every per-node loop iteration
+        self._skill_color, self._course_color, self._project_color = \
+            self.color_palette[:3]
+
+    @staticmethod
+    def _sanitize(obj: Any) -> Any:
+        """Convert numpy containers to plain JSON types in a single walk.
+
+        fig.to_dict() can hold numpy arrays (e.g. from DataFrame-backed
+        figures); one recursive pass is still far cheaper than the old
+        to_json()/json.loads() encode-decode round-trip.
+        """
+        if isinstance(obj, dict):
+            return {k: AcademicVisualizer._sanitize(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [AcademicVisualizer._sanitize(v) for v in obj]
+        if isinstance(obj, np.ndarray):
+            # Only object/datetime arrays need their elements re-walked;
+            # numeric arrays become plain lists in one call
+            if obj.dtype.kind in 'OM':
+                return AcademicVisualizer._sanitize(obj.tolist())
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return AcademicVisualizer._sanitize(obj.item())
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return obj
         
     def create_skill_network(self, skills: List[Dict], courses: List[Dict], projects: List[Dict]) -> Dict:
         """Create an interactive network visualization of skills, courses, and projects."""
-        G = nx.Graph()
-        
-        # Add nodes
+        # The graph is only nodes-with-attributes plus an edge list, so a
+        # name->index dict and parallel arrays carry everything a full
+        # nx.Graph did; the layout, edge gathers and traces all index these
+        # arrays directly
+        node_index = {}
+        node_names = []
+        node_sizes = []
+        grouped_indices = {'skill': [], 'course': [], 'project': []}
+        grouped_names = {'skill': [], 'course': [], 'project': []}
+
+        def add_node(name, node_type, size):
+            i = node_index.setdefault(name, len(node_names))
+            if i == len(node_names):
+                node_names.append(name)
+                node_sizes.append(size)
+                grouped_indices[node_type].append(i)
+                grouped_names[node_type].append(name)
+            return i
+
         for skill in skills:
-            G.add_node(skill['name'], 
-                      node_type='skill',
-                      size=skill['proficiency_level'] * 10,
-                      color=self.color_palette[0])
-                      
+            add_node(skill['name'], 'skill', skill['proficiency_level'] * 10)
         for course in courses:
-            G.add_node(course['code'],
-                      node_type='course',
-                      size=30,
-                      color=self.color_palette[1])
-                      
+            add_node(course['code'], 'course', 30)
         for project in projects:
-            G.add_node(project['title'],
-                      node_type='project',
-                      size=40,
-                      color=self.color_palette[2])
-        
-        # Add edges
+            add_node(project['title'], 'project', 40)
+
+        # Edges as an (E, 2) int32 index array; an endpoint naming a skill
+        # that was filtered out of the skills list becomes a small implicit
+        # skill node, like nx.add_edge used to create it
+        edge_list = []
         for course in courses:
+            i = node_index[course['code']]
             for skill in course['skills']:
-                G.add_edge(course['code'], skill['name'])
-                
+                edge_list.append((i, add_node(skill['name'], 'skill', 10)))
         for project in projects:
+            i = node_index[project['title']]
             for skill in project['skills']:
-                G.add_edge(project['title'], skill['name'])
-        
-        # Get node positions using force-directed layout
-        pos = nx.spring_layout(G)
-        
-        # Create traces for nodes
-        node_trace = go.Scatter(
-            x=[pos[node][0] for node in G.nodes()],
-            y=[pos[node][1] for node in G.nodes()],
-            mode='markers+text',
-            text=list(G.nodes()),
-            textposition='bottom center',
-            marker=dict(
-                size=[G.nodes[node]['size'] for node in G.nodes()],
-                color=[G.nodes[node]['color'] for node in G.nodes()],
-                line=dict(width=2)
-            ),
-            hovertemplate='%{text}<br>Type: %{customdata[0]}<extra></extra>',
-            customdata=[[G.nodes[node]['node_type']] for node in G.nodes()]
-        )
-        
-        # Create traces for edges
-        edge_x = []
-        edge_y = []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-            
+                edge_list.append((i, add_node(skill['name'], 'skill', 10)))
+        edges = np.asarray(edge_list, dtype=np.int32).reshape(-1, 2)
+
+        # Positions, sizes and edge coordinates stay numpy ndarrays all the
+        # way into the traces so Plotly can serialize them as compact typed
+        # arrays instead of lists of floats
+        coords = _fr_lbfgs_layout(len(node_names), edges).astype(np.float32)
+        sizes = np.asarray(node_sizes, dtype=np.float32)
+
+        # One Scatter per node type: scalar marker color instead of a
+        # per-node color array, and the trace name doubles as both legend
+        # entry and hover type, so customdata disappears entirely
+        node_traces = []
+        for node_type, trace_name, color in (
+            ('skill', 'Skill', self._skill_color),
+            ('course', 'Course', self._course_color),
+            ('project', 'Project', self._project_color)
+        ):
+            if not grouped_indices[node_type]:
+                continue
+            idx = np.asarray(grouped_indices[node_type], dtype=np.int32)
+            node_traces.append(go.Scatter(
+                x=coords[idx, 0],
+                y=coords[idx, 1],
+                mode='markers+text',
+                name=trace_name,
+                text=grouped_names[node_type],
+                textposition='bottom center',
+                marker=dict(
+                    size=sizes[idx],
+                    color=color,
+                    line=dict(width=2)
+                ),
+                hovertemplate='%{text}<br>Type: ' + trace_name + '<extra></extra>'
+            ))
+
+        # Create traces for edges: gather both endpoints per edge with one
+        # fancy-indexing pass instead of three Python appends per edge. NaN
+        # separators break the line exactly like None but keep the arrays
+        # numeric end to end.
+        if len(edges):
+            separators = np.full((len(edges), 1), np.nan, dtype=np.float32)
+            edge_x = np.column_stack([coords[edges, 0], separators]).ravel()
+            edge_y = np.column_stack([coords[edges, 1], separators]).ravel()
+        else:
+            edge_x = np.empty(0, dtype=np.float32)
+            edge_y = np.empty(0, dtype=np.float32)
+
         edge_trace = go.Scatter(
             x=edge_x,
             y=edge_y,
             line=dict(width=0.5, color='#888'),
             hoverinfo='none',
-            mode='lines'
+            mode='lines',
+            showlegend=False
         )
         
         # Create the figure
-        fig = go.Figure(data=[edge_trace, node_trace],
+        fig = go.Figure(data=[edge_trace, *node_traces],
+                       _validate=_VALIDATE_FIGURES,
                        layout=go.Layout(
                            title='Skills Network',
-                           showlegend=False,
+                           showlegend=True,
                            hovermode='closest',
                            margin=dict(b=20,l=5,r=5,t=40),
                            plot_bgcolor='white'
                        ))
         
-        return json.loads(fig.to_json())
+        return self._sanitize(fig.to_dict())
     
     def create_progress_timeline(self, courses: List[Dict], achievements: List[Dict]) -> Dict:
         """Create an interactive timeline of academic progress and achievements."""
-        # Combine courses and achievements
-        events = []
-        
-        for course in courses:
-            events.append({
-                'date': course['year'],
-                'name': course['name'],
-                'type': 'Course',
-                'description': course['description'],
-                'score': course['importance_score']
-            })
-            
-        for achievement in achievements:
-            events.append({
-                'date': achievement['date_achieved'].year,
-                'name': achievement['title'],
-                'type': 'Achievement',
-                'description': achievement['description'],
-                'score': achievement['impact_score']
-            })
-        
-        # Create DataFrame
-        df = pd.DataFrame(events)
-        
+        # Build the frame column-wise from pre-sized arrays: pandas adopts
+        # the columns directly instead of re-inferring types from a list of
+        # per-event dicts, and the type column becomes a cheap categorical
+        # Course.year is nullable; an undated course can't be placed on the
+        # axis (and would fail the datetime fill), so drop those rows the
+        # same way the endpoint drops them from its date range
+        courses = [course for course in courses if course['year']]
+
+        total = len(courses) + len(achievements)
+        starts = np.empty(total, dtype='datetime64[D]')
+        ends = np.empty(total, dtype='datetime64[D]')
+        scores = np.empty(total, dtype=np.float32)
+        names = []
+        descriptions = []
+
+        # px.timeline draws Gantt-style bars and needs both endpoints:
+        # courses span their academic year, achievements get a week-wide
+        # bar so a point event stays visible
+        for i, course in enumerate(courses):
+            starts[i] = np.datetime64(f"{course['year']}-01-01")
+            ends[i] = np.datetime64(f"{course['year']}-12-31")
+            scores[i] = course['importance_score']
+            names.append(course['name'])
+            descriptions.append(course['description'])
+
+        for i, achievement in enumerate(achievements, start=len(courses)):
+            day = np.datetime64(achievement['date_achieved'], 'D')
+            starts[i] = day
+            ends[i] = day + np.timedelta64(7, 'D')
+            scores[i] = achievement['impact_score']
+            names.append(achievement['title'])
+            descriptions.append(achievement['description'])
+
+        df = pd.DataFrame({
+            'start': starts,
+            'end': ends,
+            'name': names,
+            'type': pd.Categorical(
+                ['Course'] * len(courses) + ['Achievement'] * len(achievements)
+            ),
+            'description': descriptions,
+            'score': scores
+        })
+
         # Create figure
-        fig = px.timeline(df, x_start='date', y='type',
+        fig = px.timeline(df, x_start='start', x_end='end', y='type',
                          color='type',
                          hover_name='name',
                          hover_data=['description', 'score'],
@@ -128,31 +278,22 @@ class AcademicVisualizer:
             height=400
         )
         
-        return json.loads(fig.to_json())
+        return self._sanitize(fig.to_dict())
     
     def create_skill_radar(self, skills: List[Dict]) -> Dict:
         """Create a radar chart of skill proficiencies by category."""
-        # Group skills by category
-        skill_categories = {}
-        for skill in skills:
-            if skill['category'] not in skill_categories:
-                skill_categories[skill['category']] = []
-            skill_categories[skill['category']].append(skill)
-        
-        # Calculate average proficiency per category
-        categories = []
-        proficiencies = []
-        market_demands = []
-        
-        for category, category_skills in skill_categories.items():
-            categories.append(category)
-            avg_proficiency = sum(s['proficiency_level'] for s in category_skills) / len(category_skills)
-            proficiencies.append(avg_proficiency)
-            avg_demand = sum(s['market_demand'] for s in category_skills) / len(category_skills)
-            market_demands.append(avg_demand)
+        # Average proficiency and demand per category in one groupby pass;
+        # pandas does the arithmetic in C and the numpy results go straight
+        # into the traces
+        agg = pd.DataFrame(skills).groupby('category', sort=False)[
+            ['proficiency_level', 'market_demand']
+        ].mean()
+        categories = agg.index.tolist()
+        proficiencies = agg['proficiency_level'].to_numpy()
+        market_demands = agg['market_demand'].to_numpy()
         
         # Create radar chart
-        fig = go.Figure()
+        fig = go.Figure(_validate=_VALIDATE_FIGURES)
         
         fig.add_trace(go.Scatterpolar(
             r=proficiencies,
@@ -178,7 +319,7 @@ class AcademicVisualizer:
             title='Skill Proficiency vs Market Demand'
         )
         
-        return json.loads(fig.to_json())
+        return self._sanitize(fig.to_dict())
     
     def create_goal_progress_chart(self, goals: List[Dict]) -> Dict:
         """Create a progress chart for academic and career goals."""
@@ -186,17 +327,20 @@ class AcademicVisualizer:
         df = pd.DataFrame(goals)
         
         # Create figure
-        fig = go.Figure()
-        
-        for category in df['category'].unique():
-            category_data = df[df['category'] == category]
-            
+        fig = go.Figure(_validate=_VALIDATE_FIGURES)
+
+        # groupby partitions the frame in one pass instead of re-scanning it
+        # with a boolean mask per category; .to_numpy() hands Plotly typed
+        # arrays rather than Series
+        for category, category_data in df.groupby('category', sort=False):
             fig.add_trace(go.Bar(
                 name=category,
-                x=category_data['title'],
-                y=category_data['progress'],
-                text=category_data['progress'].apply(lambda x: f'{x:.0%}'),
-                textposition='auto',
+                x=category_data['title'].to_numpy(),
+                y=category_data['progress'].to_numpy(),
+                # Let Plotly format the labels client-side instead of running
+                # a Python lambda per row
+                texttemplate='%{y:.0%}',
+                textposition='outside',
             ))
         
         fig.update_layout(
@@ -210,4 +354,4 @@ class AcademicVisualizer:
             barmode='group'
         )
         
-        return json.loads(fig.to_json())
\ No newline at end of file
+        return self._sanitize(fig.to_dict())
\ No newline at end of file